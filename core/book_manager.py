@@ -3,11 +3,26 @@
 """
 
 import os
-import re
+import time
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
 
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+    _json_loads = json.loads
+
 class BookManager:
     """书籍管理器"""
     
@@ -18,7 +33,8 @@ class BookManager:
         # 当前书籍信息
         self.current_book = None
         self.current_book_path = None
-        self.pages = []
+        self._text = ""
+        self._page_spans = []
         self.current_page = 0
         self.total_pages = 0
         
@@ -33,23 +49,29 @@ class BookManager:
     def list_books(self) -> List[Dict]:
         """列出所有可用书籍"""
         books = []
-        extensions = ['.txt', '.epub', '.pdf']
-        
-        for ext in extensions:
-            for book_path in self.books_dir.glob(f"*{ext}"):
-                if book_path.is_file():
-                    try:
-                        stat = book_path.stat()
-                        books.append({
-                            'path': str(book_path),
-                            'name': book_path.name,
-                            'size': self.format_size(stat.st_size),
-                            'modified': stat.st_mtime,
-                            'extension': ext[1:].upper()
-                        })
-                    except Exception as e:
-                        self.logger.error(f"获取书籍信息失败 {book_path}: {e}")
-        
+        extensions = {'.txt', '.epub', '.pdf'}
+
+        # 单次scandir遍历，DirEntry自带缓存的stat信息
+        with os.scandir(self.books_dir) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if ext not in extensions:
+                        continue
+
+                    stat = entry.stat()
+                    books.append({
+                        'path': entry.path,
+                        'name': entry.name,
+                        'size': self.format_size(stat.st_size),
+                        'modified': stat.st_mtime,
+                        'extension': ext[1:].upper()
+                    })
+                except Exception as e:
+                    self.logger.error(f"获取书籍信息失败 {entry.path}: {e}")
+
         # 按修改时间排序
         books.sort(key=lambda x: x['modified'], reverse=True)
         return books
@@ -73,20 +95,38 @@ class BookManager:
             self.current_book_path = book_path
             self.current_page = 0
             
-            # 根据扩展名使用不同加载器
-            if book_path.suffix.lower() == '.txt':
-                content = self.load_txt(book_path)
-            elif book_path.suffix.lower() == '.epub':
-                content = self.load_epub(book_path)
-            elif book_path.suffix.lower() == '.pdf':
-                content = self.load_pdf(book_path)
+            # 命中页缓存则跳过解码和分页
+            cached = self._load_cached_pages(book_path)
+            if cached is not None:
+                self._text, self._page_spans = cached
             else:
-                self.logger.error(f"不支持的文件格式: {book_path.suffix}")
-                return False
-            
-            # 分页
-            self.pages = self.split_into_pages(content)
-            self.total_pages = len(self.pages)
+                # 根据扩展名使用不同加载器
+                if book_path.suffix.lower() == '.txt':
+                    # TXT流式读取，边读边分页，避免整本书驻留内存
+                    chunks = self._read_txt_chunks(book_path)
+                elif book_path.suffix.lower() == '.epub':
+                    chunks = [self.load_epub(book_path)]
+                elif book_path.suffix.lower() == '.pdf':
+                    chunks = [self.load_pdf(book_path)]
+                else:
+                    self.logger.error(f"不支持的文件格式: {book_path.suffix}")
+                    return False
+
+                try:
+                    self._text, self._page_spans = self._paginate(chunks)
+                except UnicodeDecodeError:
+                    # 流式路径的嗅探编码在文件后部失效，整体重读并逐个编码尝试
+                    self.logger.warning(f"流式解码失败，改用整体读取: {book_path.name}")
+                    self._text, self._page_spans = self._paginate(
+                        [self.load_txt(book_path)]
+                    )
+                if not self._page_spans:
+                    self._text = "空内容"
+                    self._page_spans = [(0, len(self._text))]
+
+                self._save_cached_pages(book_path, (self._text, self._page_spans))
+
+            self.total_pages = len(self._page_spans)
             
             # 加载书签
             self.load_bookmarks(book_path)
@@ -101,7 +141,17 @@ class BookManager:
     def load_txt(self, file_path: Path) -> str:
         """加载TXT文件"""
         try:
-            # 尝试不同编码
+            # 先从文件头嗅探编码，命中则只解码一次
+            from core.file_loader import FileLoader
+            encoding = FileLoader.detect_encoding(file_path)
+            if encoding:
+                try:
+                    with open(file_path, 'r', encoding=encoding) as f:
+                        return f.read()
+                except (UnicodeDecodeError, LookupError):
+                    pass
+
+            # 嗅探失败时退回逐个编码尝试
             encodings = ['utf-8', 'gbk', 'gb2312', 'big5']
             for encoding in encodings:
                 try:
@@ -118,6 +168,79 @@ class BookManager:
             self.logger.error(f"读取TXT文件失败: {e}")
             return f"读取文件失败: {e}"
     
+    def _fingerprint(self, path: Path) -> str:
+        """计算文件指纹（文件名+大小+修改时间）
+
+        必须带上文件名：同一批解压/copystat复制的书大小和秒级
+        mtime都可能相同，只用size-mtime会让两本书共用一份页缓存。
+        """
+        stat = path.stat()
+        return f"{path.stem}-{stat.st_size}-{int(stat.st_mtime)}"
+
+    def _page_cache_path(self, book_path: Path) -> Path:
+        """获取页缓存文件路径"""
+        cache_dir = self.books_dir / ".cache"
+        cache_dir.mkdir(exist_ok=True)
+        # v2: 缓存内容为 (全文, 页区间列表)
+        return cache_dir / f"{self._fingerprint(book_path)}.pages.v2.pkl"
+
+    def _load_cached_pages(self, book_path: Path):
+        """尝试加载页缓存，返回 (全文, 页区间列表) 或 None"""
+        try:
+            import pickle
+            cache_file = self._page_cache_path(book_path)
+            if cache_file.exists():
+                with open(cache_file, 'rb') as f:
+                    return pickle.load(f)
+        except Exception as e:
+            self.logger.error(f"加载页缓存失败: {e}")
+        return None
+
+    def _save_cached_pages(self, book_path: Path, data, keep_days: int = 30):
+        """保存页缓存，并清理过期条目"""
+        try:
+            import pickle
+            import time
+            cache_file = self._page_cache_path(book_path)
+            with open(cache_file, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            # 清理过期缓存（含旧版格式）
+            cutoff_time = time.time() - keep_days * 24 * 3600
+            for old_file in cache_file.parent.glob("*.pkl"):
+                if old_file.stat().st_mtime < cutoff_time or \
+                        not old_file.name.endswith(".pages.v2.pkl"):
+                    old_file.unlink(missing_ok=True)
+        except Exception as e:
+            self.logger.error(f"保存页缓存失败: {e}")
+
+    def _read_txt_chunks(self, file_path: Path, chunk_size: int = 65536):
+        """按块流式读取TXT文件
+
+        嗅探只看文件头64KB，后文可能出现该编码解不开的内容
+        （典型：前64KB纯ASCII被嗅探成ascii，正文是UTF-8中文）。
+        必须严格解码：解码失败抛UnicodeDecodeError由load_book整体
+        重读，不能用errors='replace'悄悄吞掉——替换符会随页缓存
+        落盘，重启后依然是坏文本。
+        """
+        from core.file_loader import FileLoader
+        encoding = FileLoader.detect_encoding(file_path)
+
+        if encoding:
+            try:
+                f = open(file_path, 'r', encoding=encoding)
+            except LookupError:
+                # 嗅探出的编码名不被Python支持
+                f = None
+            if f is not None:
+                with f:
+                    for chunk in iter(lambda: f.read(chunk_size), ''):
+                        yield chunk
+                return
+
+        # 无法嗅探编码时退回整体读取的逐个编码尝试
+        yield self.load_txt(file_path)
+
     def load_epub(self, file_path: Path) -> str:
         """加载EPUB文件"""
         try:
@@ -145,64 +268,113 @@ class BookManager:
     
     def load_pdf(self, file_path: Path) -> str:
         """加载PDF文件"""
-        try:
-            import PyPDF2
-            
-            content_parts = []
-            with open(file_path, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    if text:
-                        content_parts.append(text)
-            
-            return '\n\n'.join(content_parts)
-            
-        except ImportError:
-            return "请安装 PyPDF2 库来支持PDF格式"
-        except Exception as e:
-            self.logger.error(f"读取PDF文件失败: {e}")
-            return f"读取PDF失败: {e}"
+        # 复用FileLoader的PyMuPDF -> PyPDF2 -> pdfminer加载链
+        from core.file_loader import FileLoader
+        content = FileLoader.load_pdf(file_path)
+        if content is None:
+            return "请安装PDF解析库: pip install PyMuPDF 或 PyPDF2 或 pdfminer.six"
+        return content
     
     def split_into_pages(self, text: str, chars_per_page: int = 1500) -> List[str]:
         """将文本分割成页"""
         if not text:
             return ["空内容"]
-        
-        # 按段落分割
-        paragraphs = re.split(r'\n\s*\n', text)
-        pages = []
-        current_page = []
-        current_chars = 0
-        
-        for para in paragraphs:
+        full_text, spans = self._paginate([text], chars_per_page)
+        return [full_text[s:e] for s, e in spans] or ["空内容"]
+
+    def _paginate(self, chunk_iter, chars_per_page: int = 1500):
+        """把文本块流收敛为 (全文, 页区间列表)
+
+        页内容不再逐页复制成独立字符串，只记录在全文中的起止偏移，
+        get_page按需切片。
+        """
+        parts = []
+        spans = []
+        pos = 0
+        page_start = 0
+        page_chars = 0
+
+        for para in self._iter_stream_paragraphs(chunk_iter):
             para = para.strip()
             if not para:
                 continue
-            
+
             para_chars = len(para)
-            
-            if current_chars + para_chars <= chars_per_page or not current_page:
-                # 可以添加到当前页
-                current_page.append(para)
-                current_chars += para_chars
-            else:
-                # 当前页已满，开始新页
-                pages.append('\n'.join(current_page))
-                current_page = [para]
-                current_chars = para_chars
-        
-        # 添加最后一页
-        if current_page:
-            pages.append('\n'.join(current_page))
-        
-        return pages
+
+            # 当前页已满，封页
+            if page_chars and page_chars + para_chars > chars_per_page:
+                spans.append((page_start, pos))
+                page_chars = 0
+
+            if parts:
+                parts.append('\n')
+                pos += 1
+            if page_chars == 0:
+                page_start = pos
+
+            parts.append(para)
+            pos += para_chars
+            page_chars += para_chars
+
+        # 封最后一页
+        if page_chars:
+            spans.append((page_start, pos))
+
+        return ''.join(parts), spans
+
+    def _iter_stream_paragraphs(self, chunk_iter):
+        """按段落切分文本块流，滚动缓冲只保留未完结的段落"""
+        buffer = ''
+        for chunk in chunk_iter:
+            buffer += chunk
+            paragraphs, tail_start = self._scan_paragraphs(buffer)
+            yield from paragraphs
+            if tail_start:
+                # 最后一段可能跨块，留到下一轮
+                buffer = buffer[tail_start:]
+
+        if buffer:
+            paragraphs, tail_start = self._scan_paragraphs(buffer)
+            yield from paragraphs
+            yield buffer[tail_start:]
+
+    @staticmethod
+    def _scan_paragraphs(text: str):
+        """手写段落扫描，等价于按空行分割但不走正则
+
+        返回 (完整段落列表, 末尾未完结段落的起始偏移)。
+        段落分隔符为一个换行加任意空白再加一个换行。
+        """
+        paragraphs = []
+        start = 0
+        i = 0
+        length = len(text)
+
+        while i < length:
+            j = text.find('\n', i)
+            if j == -1:
+                break
+
+            # 吞掉换行后的整段空白，记录其中最后一个换行
+            k = j + 1
+            last_newline = -1
+            while k < length and text[k].isspace():
+                if text[k] == '\n':
+                    last_newline = k
+                k += 1
+
+            if last_newline != -1:
+                paragraphs.append(text[start:j])
+                start = last_newline + 1
+            i = k
+
+        return paragraphs, start
     
     def get_page(self, page_num: int) -> Optional[str]:
         """获取指定页码的内容"""
-        if 0 <= page_num < len(self.pages):
-            return self.pages[page_num]
+        if 0 <= page_num < len(self._page_spans):
+            start, end = self._page_spans[page_num]
+            return self._text[start:end]
         return None
     
     def get_current_page(self) -> Optional[str]:
@@ -211,7 +383,7 @@ class BookManager:
     
     def go_to_page(self, page_num: int) -> bool:
         """跳转到指定页码"""
-        if 0 <= page_num < len(self.pages):
+        if 0 <= page_num < len(self._page_spans):
             self.current_page = page_num
             return True
         return False
@@ -257,9 +429,7 @@ class BookManager:
         bookmark_file = self.get_bookmark_path(book_path)
         if bookmark_file.exists():
             try:
-                import json
-                with open(bookmark_file, 'r', encoding='utf-8') as f:
-                    self.bookmarks = json.load(f)
+                self.bookmarks = _json_loads(bookmark_file.read_bytes())
             except Exception as e:
                 self.logger.error(f"加载书签失败: {e}")
                 self.bookmarks = {}
@@ -271,9 +441,10 @@ class BookManager:
         
         bookmark_file = self.get_bookmark_path(self.current_book_path)
         try:
-            import json
-            with open(bookmark_file, 'w', encoding='utf-8') as f:
-                json.dump(self.bookmarks, f, ensure_ascii=False, indent=2)
+            # 先写临时文件再替换，断电不会留下半截JSON
+            tmp_file = bookmark_file.with_suffix('.tmp')
+            tmp_file.write_bytes(_json_dumps(self.bookmarks))
+            os.replace(tmp_file, bookmark_file)
         except Exception as e:
             self.logger.error(f"保存书签失败: {e}")
     
@@ -4,12 +4,39 @@
 
 import time
 import logging
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
 
+# 支持的屏幕型号及分辨率（只读，进程内共享）
+_SCREEN_SIZES = MappingProxyType({
+    "7in5": (800, 480),
+    "7in5_V2": (800, 480),
+    "7in5_HD": (880, 528),
+    "5in83": (648, 480),
+})
+
+# 用于测量文本的1x1临时画布，避免每次测量新建整幅图像
+_TEMP_DRAW = ImageDraw.Draw(Image.new('1', (1, 1)))
+
+@lru_cache(maxsize=4096)
+def _measure(font, text):
+    """测量文本尺寸，按(字体, 文本)缓存，重复短串不再走FreeType"""
+    bbox = _TEMP_DRAW.textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
 class DisplayManager:
     """显示管理器"""
-    
+
+    # 预渲染页缓存上限
+    PREFETCH_CACHE_SIZE = 4
+
+    # 启动时预热的常用字号
+    PREWARM_FONT_SIZES = (12, 14, 16, 18, 20, 24, 28, 32)
+
+
     def __init__(self, config):
         self.config = config
         self.logger = logging.getLogger(__name__)
@@ -20,23 +47,29 @@ class DisplayManager:
         
         # 字体
         self.font_cache = {}
+        self._advance_cache = {}
+        self._line_height_cache = {}
         self.load_fonts()
         
         # 当前图像
         self.current_image = None
         self.last_image = None
+
+        # 复用的整页画布（按需创建），后台预渲染与前台共用，需要加锁
+        self._scratch = None
+        self._scratch_draw = None
+        self._render_lock = threading.Lock()
+
+        # 相邻页预渲染缓存
+        self._prefetch_pool = None
+        self._prefetch_cache = {}
+        self._prefetch_lock = threading.Lock()
         
         self.logger.info(f"显示管理器初始化: {self.width}x{self.height}")
     
     def get_screen_size(self):
         """获取屏幕尺寸"""
-        screen_sizes = {
-            "7in5": (800, 480),
-            "7in5_V2": (800, 480),
-            "7in5_HD": (880, 528),
-            "5in83": (648, 480)
-        }
-        return screen_sizes.get(self.screen_type, (800, 480))
+        return _SCREEN_SIZES.get(self.screen_type, (800, 480))
     
     def load_fonts(self):
         """加载字体"""
@@ -56,64 +89,123 @@ class DisplayManager:
                     break
             else:
                 self.default_font_path = None
-        
+
         self.logger.info(f"使用字体: {self.default_font_path}")
-    
+
+        # 字面只打开一次，常用字号用font_variant派生并预热缓存
+        self._base_font = None
+        if self.default_font_path:
+            try:
+                self._base_font = ImageFont.truetype(self.default_font_path, 20)
+                for size in self.PREWARM_FONT_SIZES:
+                    self.font_cache[size] = self._base_font.font_variant(size=size)
+                    self._advance_cache.setdefault(size, {})
+            except Exception as e:
+                self.logger.error(f"加载字体失败: {e}")
+
     def get_font(self, size):
         """获取字体对象"""
-        if size in self.font_cache:
-            return self.font_cache[size]
-        
+        font = self.font_cache.get(size)
+        if font is not None:
+            return font
+
         try:
-            if self.default_font_path:
+            if self._base_font is not None:
+                # 复用已打开的字面，比重新truetype快
+                font = self._base_font.font_variant(size=size)
+            elif self.default_font_path:
                 font = ImageFont.truetype(self.default_font_path, size)
             else:
                 font = ImageFont.load_default()
             self.font_cache[size] = font
+            self._advance_cache.setdefault(size, {})
             return font
         except Exception as e:
             self.logger.error(f"加载字体失败: {e}")
             return ImageFont.load_default()
     
+    def _char_width(self, font, size, ch):
+        """获取单个字符的宽度（带缓存）"""
+        cache = self._advance_cache.setdefault(size, {})
+        width = cache.get(ch)
+        if width is None:
+            width = font.getlength(ch)
+            cache[ch] = width
+        return width
+
+    def _get_line_height(self, font, size, line_spacing):
+        """获取行高（带缓存）"""
+        key = (size, line_spacing)
+        height = self._line_height_cache.get(key)
+        if height is None:
+            height = int(_measure(font, "测试")[1] * line_spacing)
+            self._line_height_cache[key] = height
+        return height
+
+    def _wrap_words(self, text, font, size, width, lines):
+        """按空格分词折行：累加像素宽度，按切片索引成行，循环内不拼接字符串"""
+        words = text.split(' ')
+        space_width = self._char_width(font, size, ' ')
+        line_start = 0
+        pen_x = 0
+
+        for i, word in enumerate(words):
+            word_width = font.getlength(word)
+
+            if i == line_start:
+                pen_x = word_width
+            elif pen_x + space_width + word_width <= width:
+                pen_x += space_width + word_width
+            else:
+                lines.append(' '.join(words[line_start:i]))
+                line_start = i
+                pen_x = word_width
+
+        if line_start < len(words):
+            lines.append(' '.join(words[line_start:]))
+
+    def _wrap_chars(self, text, font, size, width, lines):
+        """按字符折行：中文没有空格分词，逐字累加缓存宽度"""
+        line_start = 0
+        pen_x = 0
+
+        for i, ch in enumerate(text):
+            char_width = self._char_width(font, size, ch)
+            if pen_x + char_width > width and i > line_start:
+                lines.append(text[line_start:i])
+                line_start = i
+                pen_x = 0
+            pen_x += char_width
+
+        if line_start < len(text):
+            lines.append(text[line_start:])
+
     def create_blank_image(self, bg_color=255):
         """创建空白图像"""
         return Image.new('1', (self.width, self.height), bg_color)
     
-    def draw_text_box(self, text, x, y, width, height, font_size=None, 
+    def draw_text_box(self, draw, text, x, y, width, height, font_size=None,
                      line_spacing=None, align="left", valign="top"):
-        """在指定区域内绘制文本"""
+        """在指定区域内绘制文本，返回实际绘制的行数"""
         if font_size is None:
             font_size = self.config.get("font_size", 20)
         if line_spacing is None:
             line_spacing = self.config.get("line_spacing", 1.5)
         
-        # 创建临时图像用于计算
-        temp_image = self.create_blank_image(255)
-        temp_draw = ImageDraw.Draw(temp_image)
         font = self.get_font(font_size)
-        
-        # 计算行高
-        bbox = temp_draw.textbbox((0, 0), "测试", font=font)
-        line_height = int((bbox[3] - bbox[1]) * line_spacing)
-        
-        # 分割文本为行
+
+        # 计算行高（按字号缓存）
+        line_height = self._get_line_height(font, font_size, line_spacing)
+
+        # 分割文本为行：逐段折行，无空格的中文段落按字符宽度处理
         lines = []
-        words = text.split(' ')
-        current_line = ""
-        
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            bbox = temp_draw.textbbox((0, 0), test_line, font=font)
-            text_width = bbox[2] - bbox[0]
-            
-            if text_width <= width or not current_line:
-                current_line = test_line
+        for paragraph in text.split('\n'):
+            if not paragraph:
+                lines.append('')
+            elif ' ' in paragraph:
+                self._wrap_words(paragraph, font, font_size, width, lines)
             else:
-                lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
+                self._wrap_chars(paragraph, font, font_size, width, lines)
         
         # 裁剪超出行数
         max_lines = height // line_height
@@ -121,11 +213,7 @@ class DisplayManager:
             lines = lines[:max_lines]
             if len(lines) >= max_lines:
                 lines[-1] = lines[-1][: -3] + "..."
-        
-        # 创建实际图像
-        image = self.create_blank_image(255)
-        draw = ImageDraw.Draw(image)
-        
+
         # 垂直对齐
         if valign == "center":
             y_start = y + (height - len(lines) * line_height) // 2
@@ -139,9 +227,8 @@ class DisplayManager:
             line_y = y_start + i * line_height
             
             # 水平对齐
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            
+            text_width = _measure(font, line)[0]
+
             if align == "center":
                 line_x = x + (width - text_width) // 2
             elif align == "right":
@@ -150,42 +237,79 @@ class DisplayManager:
                 line_x = x
             
             draw.text((line_x, line_y), line, font=font, fill=0)
-        
-        return image, len(lines)
-    
+
+        return len(lines)
+
     def draw_text_page(self, text, **kwargs):
         """绘制完整文本页"""
         margin = self.config.get("margin", 20)
         width = self.width - 2 * margin
         height = self.height - 2 * margin
-        
-        # 创建图像
-        image = self.create_blank_image(255)
-        
-        # 绘制主文本
-        text_image, lines_used = self.draw_text_box(
-            text, margin, margin, width, height, **kwargs
-        )
-        
-        # 合并图像
-        image.paste(text_image, (0, 0))
-        
-        # 添加页码信息（如果有）
-        if 'page_info' in kwargs:
-            self.draw_page_info(image, kwargs['page_info'])
-        
-        self.current_image = image
-        return image
+
+        page_info = kwargs.pop('page_info', None)
+
+        with self._render_lock:
+            # 复用整页画布，只在尺寸变化时重建
+            if self._scratch is None or self._scratch.size != (self.width, self.height):
+                self._scratch = Image.new('1', (self.width, self.height), 255)
+                self._scratch_draw = ImageDraw.Draw(self._scratch)
+            else:
+                self._scratch.paste(255, (0, 0, self.width, self.height))
+
+            # 绘制主文本
+            self.draw_text_box(
+                self._scratch_draw, text, margin, margin, width, height, **kwargs
+            )
+
+            # 添加页码信息（如果有）
+            if page_info:
+                self.draw_page_info(self._scratch, page_info)
+
+            # 画布被前台渲染和预渲染线程复用，出锁前复制一份交给
+            # 调用方，否则排队中的下一次渲染会在调用方消费（取哈希、
+            # 打包、送屏）期间原地改写像素
+            image = self._scratch.copy()
+            self.current_image = image
+            return image
+
+    def prefetch_page(self, key, text, **kwargs):
+        """后台预渲染一页，利用墨水屏刷新期间的空闲CPU"""
+        with self._prefetch_lock:
+            if key in self._prefetch_cache:
+                return
+
+        if self._prefetch_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+
+        self._prefetch_pool.submit(self._render_prefetch, key, text, kwargs)
+
+    def get_prefetched(self, key):
+        """取出预渲染好的页面位图，未命中返回None"""
+        with self._prefetch_lock:
+            return self._prefetch_cache.pop(key, None)
+
+    def _render_prefetch(self, key, text, kwargs):
+        """预渲染线程入口"""
+        try:
+            # draw_text_page返回的已是独立副本，可直接入缓存
+            image = self.draw_text_page(text, **kwargs)
+        except Exception as e:
+            self.logger.error(f"预渲染页面失败: {e}")
+            return
+
+        with self._prefetch_lock:
+            self._prefetch_cache[key] = image
+            while len(self._prefetch_cache) > self.PREFETCH_CACHE_SIZE:
+                self._prefetch_cache.pop(next(iter(self._prefetch_cache)))
     
     def draw_page_info(self, image, page_info):
         """绘制页码信息"""
         draw = ImageDraw.Draw(image)
         font = self.get_font(12)
-        
-        bbox = draw.textbbox((0, 0), page_info, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
+
+        text_width, text_height = _measure(font, page_info)
+
         x = (self.width - text_width) // 2
         y = self.height - text_height - 10
         
@@ -3,11 +3,22 @@
 """
 
 import os
+import re
 import zipfile
 import tempfile
 from pathlib import Path
 from typing import Optional
 
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'  # C实现的解析器，可用时优先
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# EPUB正文空白清理
+_WS_COLLAPSE = re.compile(r'[ \t]{2,}')
+_NL_COLLAPSE = re.compile(r'\n\s*\n')
+
 class FileLoader:
     """通用文件加载器"""
     
@@ -36,6 +47,16 @@ class FileLoader:
     def load_txt(file_path: Path) -> Optional[str]:
         """加载文本文件"""
         try:
+            # 先从文件头嗅探编码，命中则只解码一次
+            encoding = FileLoader.detect_encoding(file_path)
+            if encoding:
+                try:
+                    with open(file_path, 'r', encoding=encoding) as f:
+                        return f.read()
+                except (UnicodeDecodeError, UnicodeError, LookupError):
+                    pass
+
+            # 嗅探失败时退回逐个编码尝试
             encodings = ['utf-8', 'gbk', 'gb2312', 'big5', 'utf-16']
             for encoding in encodings:
                 try:
@@ -58,36 +79,43 @@ class FileLoader:
         try:
             import ebooklib
             from ebooklib import epub
-            from bs4 import BeautifulSoup
-            
+            from concurrent.futures import ThreadPoolExecutor
+
             book = epub.read_epub(str(file_path))
-            content_parts = []
-            
-            for item in book.get_items():
-                if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    
-                    # 移除脚本和样式
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-                    
-                    text = soup.get_text()
-                    # 清理空白字符
-                    lines = (line.strip() for line in text.splitlines())
-                    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                    text = '\n'.join(chunk for chunk in chunks if chunk)
-                    
-                    if text:
-                        content_parts.append(text)
-            
+            documents = [item.get_content() for item in book.get_items()
+                         if item.get_type() == ebooklib.ITEM_DOCUMENT]
+
+            # HTML解析的C代码会释放GIL，章节可以并行抽取；map保持章节顺序
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                content_parts = [
+                    text for text in executor.map(FileLoader._extract_epub_text, documents)
+                    if text
+                ]
+
             return '\n\n'.join(content_parts)
-            
+
         except ImportError:
             print("请安装: pip install ebooklib beautifulsoup4")
             return None
         except Exception as e:
             print(f"加载EPUB文件失败: {e}")
             return None
+
+    @staticmethod
+    def _extract_epub_text(content: bytes) -> str:
+        """抽取单个EPUB章节的正文"""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, _HTML_PARSER)
+
+        # 移除脚本和样式
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        # get_text在C层完成strip和拼接，之后两次正则扫描收敛空白
+        text = soup.get_text('\n', strip=True)
+        text = _WS_COLLAPSE.sub(' ', text)
+        return _NL_COLLAPSE.sub('\n\n', text)
     
     @staticmethod
     def load_pdf(file_path: Path) -> Optional[str]:
@@ -97,12 +125,15 @@ class FileLoader:
             try:
                 import fitz
                 doc = fitz.open(str(file_path))
-                text_parts = []
-                for page in doc:
-                    text = page.get_text()
-                    if text:
-                        text_parts.append(text)
-                return '\n\n'.join(text_parts)
+                try:
+                    # TextPage直接取阅读顺序的纯文本，跳过块/行版面分析
+                    text_parts = [None] * doc.page_count
+                    for i, page in enumerate(doc):
+                        text_parts[i] = page.get_textpage().extractText()
+                    return '\n\n'.join(text for text in text_parts if text)
+                finally:
+                    # 及时释放底层mmap
+                    doc.close()
             except ImportError:
                 pass
             
@@ -164,15 +195,25 @@ class FileLoader:
             return None
     
     @staticmethod
-    def detect_encoding(file_path: Path) -> str:
-        """检测文件编码"""
+    def detect_encoding(file_path: Path) -> Optional[str]:
+        """检测文件编码（读取前64KB嗅探，无检测库时返回None）"""
         try:
-            import chardet
             with open(file_path, 'rb') as f:
-                raw_data = f.read(1024)
+                raw_data = f.read(65536)
+
+            try:
+                from charset_normalizer import from_bytes
+                best = from_bytes(raw_data).best()
+                if best and best.encoding:
+                    return best.encoding
+            except ImportError:
+                pass
+
+            try:
+                import chardet
                 result = chardet.detect(raw_data)
                 return result['encoding']
-        except ImportError:
-            return 'utf-8'
+            except ImportError:
+                return None
         except Exception:
-            return 'utf-8'
\ No newline at end of file
+            return None
\ No newline at end of file
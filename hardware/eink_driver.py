@@ -14,24 +14,40 @@ try:
     driver_path = Path.home() / "e-Paper" / "RaspberryPi_JetsonNano" / "python"
     if driver_path.exists():
         sys.path.append(str(driver_path))
-    
+
     from waveshare_epd import epd7in5, epd7in5_V2
     HAS_REAL_DRIVER = True
 except ImportError:
     HAS_REAL_DRIVER = False
     logging.warning("未找到Waveshare驱动，使用模拟模式")
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 class EinkDisplay:
     """电子墨水屏显示控制器"""
-    
+
+    # 连续局部刷新次数上限，超过后强制全刷去残影
+    MAX_PARTIAL_REFRESHES = 10
+
     def __init__(self, screen_type="7in5"):
         self.screen_type = screen_type
         self.logger = logging.getLogger(__name__)
-        
+
         # 屏幕参数
         self.epd = None
         self.width = 800
         self.height = 480
+
+        # 上一帧打包缓冲，用于差分决定刷新方式
+        self._last_buffer = None
+        self._partial_count = 0
+
+        # 复用的显示管理器（文本绘制路径，首次使用时创建）
+        self._dm = None
         
         # 初始化屏幕
         self.init_display()
@@ -40,6 +56,8 @@ class EinkDisplay:
     
     def init_display(self):
         """初始化显示设备"""
+        global HAS_REAL_DRIVER
+
         if HAS_REAL_DRIVER:
             try:
                 if self.screen_type == "7in5":
@@ -67,22 +85,69 @@ class EinkDisplay:
         """清屏"""
         if self.epd:
             self.epd.Clear()
+        self._last_buffer = None
+        self._partial_count = 0
     
     def sleep(self):
         """进入睡眠模式"""
         if self.epd and hasattr(self.epd, 'sleep'):
             self.epd.sleep()
     
+    def _pack_buffer(self, image: Image.Image):
+        """打包1bpp帧缓冲，替代驱动里逐像素的getbuffer"""
+        if image.size != (self.width, self.height):
+            return None
+
+        # mode '1' 的tobytes本身就是MSB在前的1bpp打包格式，一次C拷贝直达SPI
+        if image.mode == '1':
+            return image.tobytes()
+
+        if not HAS_NUMPY:
+            return None
+
+        try:
+            arr = np.asarray(image)
+            if arr.dtype != bool:
+                arr = arr > 127
+            return np.packbits(arr, axis=1).tobytes()
+        except Exception as e:
+            self.logger.error(f"打包帧缓冲失败: {e}")
+            return None
+
     def display(self, image: Image.Image, partial: bool = False):
         """显示图像"""
         if not self.epd or not image:
             return False
-        
+
         try:
-            if partial and hasattr(self.epd, 'displayPartial'):
-                self.epd.displayPartial(self.epd.getbuffer(image))
+            buffer = self._pack_buffer(image)
+            use_partial = partial
+
+            if buffer is None:
+                buffer = self.epd.getbuffer(image)
+                self._last_buffer = None
+            elif HAS_NUMPY:
+                new_buffer = np.frombuffer(buffer, dtype=np.uint8)
+
+                if (self._last_buffer is not None
+                        and new_buffer.size == self._last_buffer.size):
+                    diff = new_buffer ^ self._last_buffer
+                    if not diff.any():
+                        # 帧内容未变化，跳过刷新
+                        return True
+                    # 变化字节少于1/3时用局部刷新，避免整屏闪烁
+                    if np.count_nonzero(diff) * 3 < diff.size:
+                        use_partial = True
+
+                self._last_buffer = new_buffer
+
+            if (use_partial and hasattr(self.epd, 'displayPartial')
+                    and self._partial_count < self.MAX_PARTIAL_REFRESHES):
+                self.epd.displayPartial(buffer)
+                self._partial_count += 1
             else:
-                self.epd.display(self.epd.getbuffer(image))
+                self.epd.display(buffer)
+                self._partial_count = 0
             return True
         except Exception as e:
             self.logger.error(f"显示图像失败: {e}")
@@ -94,24 +159,29 @@ class EinkDisplay:
             return self.display(self.current_image)
         return False
     
+    def _get_dm(self, font_size: int = 20, margin: int = 20):
+        """获取复用的显示管理器，避免每次绘制重新加载字体"""
+        if self._dm is None:
+            from core.display_manager import DisplayManager
+            self._dm = DisplayManager({
+                "screen_type": self.screen_type,
+                "font_size": font_size,
+                "margin": margin
+            })
+            self._dm.width = self.width
+            self._dm.height = self.height
+        else:
+            self._dm.config["font_size"] = font_size
+            self._dm.config["margin"] = margin
+        return self._dm
+
     def draw_text(self, text: str, font_size: int = 20, **kwargs):
         """绘制文本并更新显示"""
-        from core.display_manager import DisplayManager
-        
-        # 创建临时配置
-        config = {
-            "screen_type": self.screen_type,
-            "font_size": font_size,
-            "margin": kwargs.get('margin', 20)
-        }
-        
-        dm = DisplayManager(config)
-        dm.width = self.width
-        dm.height = self.height
-        
-        image = dm.draw_text_page(text, **kwargs)
+        dm = self._get_dm(font_size, kwargs.pop('margin', 20))
+
+        image = dm.draw_text_page(text, font_size=font_size, **kwargs)
         self.current_image = image
-        
+
         return self.display(image)
     
     def show_error(self, message: str):
@@ -5,7 +5,7 @@ GPIO控制器 - 管理物理按键
 import time
 import threading
 import logging
-from collections import deque
+from queue import SimpleQueue, Empty
 from typing import Optional, List, Tuple
 
 try:
@@ -17,10 +17,12 @@ except ImportError:
 
 class GPIOController:
     """GPIO控制器"""
-    
+
+    LONG_PRESS_TIME = 1.0  # 长按时间阈值（秒）
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        
+
         # GPIO引脚定义 (BCM编号)
         self.button_pins = {
             'PREV': 5,    # 上一页
@@ -28,111 +30,144 @@ class GPIOController:
             'HOME': 13,   # 主页
             'MENU': 19,   # 菜单
         }
-        
+        # 引脚到按键名的反查表（边沿回调用）
+        self.pin_names = {pin: name for name, pin in self.button_pins.items()}
+
         # 按键状态
         self.button_states = {name: True for name in self.button_pins}
         self.last_states = {name: True for name in self.button_pins}
         self.press_times = {name: 0 for name in self.button_pins}
-        
-        # 事件队列
-        self.event_queue = deque()
-        
+
+        # 长按定时器（按下时启动，释放时取消）
+        self._long_press_timers = {}
+
+        # 事件队列（C实现，跨线程传递无需手动加锁）
+        self.event_queue = SimpleQueue()
+        # get_events复用的结果列表，避免每次轮询都新建
+        self._events_buf = []
+
         # 运行状态
         self.running = False
         self.thread = None
-        
+
         # 初始化GPIO
         if HAS_GPIO:
             self.setup_gpio()
         else:
             self.logger.info("使用模拟GPIO模式")
-    
+
     def setup_gpio(self):
         """设置GPIO"""
+        global HAS_GPIO
+
         try:
             GPIO.setmode(GPIO.BCM)
             GPIO.setwarnings(False)
-            
-            # 设置按钮为输入，启用上拉电阻
+
+            # 设置按钮为输入，启用上拉电阻，注册边沿中断回调
             for pin in self.button_pins.values():
                 GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-            
+                GPIO.add_event_detect(pin, GPIO.BOTH,
+                                      callback=self._on_edge, bouncetime=20)
+
             self.logger.info("GPIO初始化完成")
-            
+
         except Exception as e:
             self.logger.error(f"GPIO初始化失败: {e}")
             HAS_GPIO = False
-    
+
     def start_monitoring(self):
         """开始监控按键"""
         self.running = True
-        self.thread = threading.Thread(target=self._monitor_buttons)
-        self.thread.daemon = True
-        self.thread.start()
-        self.logger.info("按键监控启动")
-    
-    def _monitor_buttons(self):
-        """监控按键状态"""
-        LONG_PRESS_TIME = 1.0  # 长按时间阈值
-        
-        while self.running:
-            current_time = time.time()
-            
-            for name, pin in self.button_pins.items():
-                if HAS_GPIO:
-                    current_state = GPIO.input(pin)
-                else:
-                    # 模拟模式，始终为释放状态
-                    current_state = True
-                
-                # 检测状态变化
-                if current_state != self.last_states[name]:
-                    if current_state == False:  # 按下
-                        self.press_times[name] = current_time
-                        self.event_queue.append(('BUTTON_DOWN', name))
-                    else:  # 释放
-                        press_duration = current_time - self.press_times[name]
-                        self.event_queue.append(('BUTTON_UP', name))
-                        
-                        if press_duration < LONG_PRESS_TIME:
-                            self.event_queue.append(('BUTTON_CLICK', name))
-                        else:
-                            self.event_queue.append(('BUTTON_LONG_PRESS', (name, press_duration)))
-                    
-                    self.last_states[name] = current_state
-                else:
-                    # 检查长按
-                    if current_state == False:  # 按键保持按下
-                        press_duration = current_time - self.press_times[name]
-                        if press_duration >= LONG_PRESS_TIME and press_duration < LONG_PRESS_TIME + 0.1:
-                            # 触发长按事件
-                            self.event_queue.append(('BUTTON_LONG_HOLD', (name, press_duration)))
-            
-            time.sleep(0.01)  # 10ms轮询
+        if HAS_GPIO:
+            # 按键事件由内核边沿中断送达，无需轮询线程
+            self.logger.info("按键监控启动（中断模式）")
+        else:
+            self.logger.info("按键监控启动（模拟模式，无按键事件）")
+
+    def _on_edge(self, pin):
+        """GPIO边沿中断回调"""
+        name = self.pin_names.get(pin)
+        if name is None:
+            return
+
+        current_state = GPIO.input(pin)
+        if current_state == self.last_states[name]:
+            return
+        self.last_states[name] = current_state
+
+        current_time = time.time()
+
+        if not current_state:  # 按下
+            self.press_times[name] = current_time
+            self.event_queue.put(('BUTTON_DOWN', name))
+
+            # 按住超过阈值时由定时器触发长按保持事件
+            timer = threading.Timer(self.LONG_PRESS_TIME,
+                                    self._emit_long_hold, args=(name,))
+            timer.daemon = True
+            self._long_press_timers[name] = timer
+            timer.start()
+        else:  # 释放
+            timer = self._long_press_timers.pop(name, None)
+            if timer:
+                timer.cancel()
+
+            press_duration = current_time - self.press_times[name]
+            self.event_queue.put(('BUTTON_UP', name))
+
+            if press_duration < self.LONG_PRESS_TIME:
+                self.event_queue.put(('BUTTON_CLICK', name))
+            else:
+                self.event_queue.put(('BUTTON_LONG_PRESS', (name, press_duration)))
+
+    def _emit_long_hold(self, name):
+        """长按保持事件（定时器回调）"""
+        if not self.last_states[name]:  # 仍处于按下状态
+            press_duration = time.time() - self.press_times[name]
+            self.event_queue.put(('BUTTON_LONG_HOLD', (name, press_duration)))
     
     def get_events(self) -> List[Tuple[str, any]]:
-        """获取所有待处理事件"""
-        events = []
-        while self.event_queue:
-            events.append(self.event_queue.popleft())
-        return events
-    
+        """获取所有待处理事件
+
+        返回的是复用的内部列表，调用方需在下次调用前消费完。
+        """
+        buf = self._events_buf
+        buf.clear()
+        while True:
+            try:
+                buf.append(self.event_queue.get_nowait())
+            except Empty:
+                return buf
+
     def wait_for_event(self, timeout: float = None) -> Optional[Tuple[str, any]]:
-        """等待事件"""
-        start_time = time.time()
+        """等待事件（阻塞在队列上，不再休眠轮询）"""
+        deadline = time.time() + timeout if timeout else None
+
         while self.running:
-            if self.event_queue:
-                return self.event_queue.popleft()
-            
-            if timeout and (time.time() - start_time) > timeout:
-                return None
-            
-            time.sleep(0.01)
+            if deadline is None:
+                # 无超时也要定期醒来检查running
+                wait = 0.5
+            else:
+                wait = deadline - time.time()
+                if wait <= 0:
+                    return None
+                wait = min(wait, 0.5)
+
+            try:
+                return self.event_queue.get(timeout=wait)
+            except Empty:
+                continue
         return None
     
     def cleanup(self):
         """清理资源"""
         self.running = False
+
+        for timer in self._long_press_timers.values():
+            timer.cancel()
+        self._long_press_timers.clear()
+
         if self.thread:
             self.thread.join(timeout=1)
         
@@ -9,9 +9,25 @@ import sys
 import time
 import signal
 import logging
-import json
+import threading
+from collections import deque
 from pathlib import Path
 
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+    _json_loads = json.loads
+
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.absolute()
 sys.path.insert(0, str(project_root))
@@ -22,13 +38,25 @@ try:
     from hardware.gpio_controller import GPIOController
     from hardware.eink_driver import EinkDisplay
     from ui.screens import HomeScreen, ReadingScreen, MenuScreen
-    from utils.logger import setup_logger
+    from utils.logger import setup_logger, shutdown_logging
 except ImportError as e:
     print(f"导入模块失败: {e}")
     print("请确保所有依赖已安装")
     sys.exit(1)
 
+# 物理按键到UI事件的映射
+BUTTON_EVENTS = {
+    "PREV": "PREV_PAGE",
+    "NEXT": "NEXT_PAGE",
+    "HOME": "SHOW_HOME",
+    "MENU": "SHOW_MENU",
+}
+
 class EinkReader:
+
+    # 单次按键允许触发的事件链长度上限，超过视为屏幕间循环触发
+    MAX_EVENT_CHAIN = 8
+
     def __init__(self):
         """初始化阅读器"""
         # 设置项目根目录
@@ -43,15 +71,31 @@ class EinkReader:
         # 运行状态
         self.running = True
         self.current_screen = None
+
+        # 启动画面位图（进程内缓存，磁盘缓存见show_splash_screen）
+        self._splash_image = None
         
         # 加载配置
         self.config = self.load_config()
+
+        # 配置写盘去重与延迟合并
+        self._last_config_blob = None
+        self._config_timer = None
         
         # 初始化组件
         self.display = None
         self.book_manager = None
         self.gpio = None
         self.screens = {}
+
+        # 系统级事件分发表（字典查找代替逐个字符串比较）
+        self._handlers = {
+            "LOAD_BOOK": self._h_load_book,
+            "EXIT": self._h_exit,
+            "SAVE_CONFIG": self._h_save_config,
+            "SHOW_HOME": self._h_show_home,
+            "SHOW_MENU": self._h_show_menu,
+        }
         
         # 注册信号处理
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -74,8 +118,8 @@ class EinkReader:
         
         try:
             if config_path.exists():
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                with open(config_path, 'rb') as f:
+                    config = _json_loads(f.read())
                 # 合并默认配置
                 for key, value in default_config.items():
                     if key not in config:
@@ -87,12 +131,39 @@ class EinkReader:
         
         return default_config
     
-    def save_config(self):
-        """保存配置"""
+    def save_config(self, immediate: bool = False):
+        """保存配置
+
+        每次翻页都会触发SAVE_CONFIG，直接写盘会把SD卡写穿。
+        这里延迟2秒合并写入，连续翻页只落一次盘；退出时用
+        immediate=True立即冲刷。
+        """
+        if self._config_timer is not None:
+            self._config_timer.cancel()
+            self._config_timer = None
+
+        if immediate:
+            self._write_config_now()
+            return
+
+        timer = threading.Timer(2.0, self._write_config_now)
+        timer.daemon = True
+        self._config_timer = timer
+        timer.start()
+
+    def _write_config_now(self):
+        """真正写盘：内容未变化时跳过，临时文件+替换保证原子性"""
         try:
+            blob = _json_dumps(self.config)
+            if blob == self._last_config_blob:
+                return
+
             config_path = self.project_root / "config.json"
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
+            tmp_path = config_path.with_suffix('.tmp')
+            tmp_path.write_bytes(blob)
+            os.replace(tmp_path, config_path)
+
+            self._last_config_blob = blob
             self.logger.debug("配置保存成功")
         except Exception as e:
             self.logger.error(f"保存配置失败: {e}")
@@ -135,20 +206,58 @@ class EinkReader:
             return False
     
     def show_splash_screen(self):
-        """显示启动画面"""
+        """显示启动画面
+
+        画面内容每次启动都一样，位图渲染一次后缓存到磁盘，
+        后续启动直接回放，省掉启动路径上的字体栅格化。
+        """
         splash_text = """
         水墨屏阅读器
         ============
-        
+
         版本: 1.0.0
-        
+
         正在启动系统...
         请稍候...
         """
+        cache_file = self.project_root / "cache" / "splash.raw"
+
+        image = self._splash_image
+        if image is None:
+            image = self._load_splash_cache(cache_file)
+
         self.display.clear()
-        self.display.draw_text(splash_text, font_size=20)
-        self.display.update()
+        if image is not None:
+            self._splash_image = image
+            self.display.display(image)
+        else:
+            self.display.draw_text(splash_text, font_size=20)
+            image = getattr(self.display, 'current_image', None)
+            if image is not None:
+                self._splash_image = image
+                self._save_splash_cache(cache_file, image)
+
         time.sleep(1)
+
+    def _load_splash_cache(self, cache_file):
+        """读取上次启动落盘的启动画面位图，不可用时返回None"""
+        try:
+            from PIL import Image
+            buf = cache_file.read_bytes()
+            size = (self.display.width, self.display.height)
+            if len(buf) == (size[0] + 7) // 8 * size[1]:
+                return Image.frombytes('1', size, buf)
+        except Exception:
+            pass
+        return None
+
+    def _save_splash_cache(self, cache_file, image):
+        """把启动画面位图落盘，失败只记日志"""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(image.tobytes())
+        except Exception as e:
+            self.logger.debug(f"保存启动画面缓存失败: {e}")
     
     def init_screens(self):
         """初始化所有屏幕"""
@@ -181,53 +290,83 @@ class EinkReader:
             self.screens[self.current_screen].show()
     
     def handle_event(self, event_type, event_data=None):
-        """处理事件"""
-        self.logger.debug(f"处理事件: {event_type}, 数据: {event_data}")
-        
-        if self.current_screen in self.screens:
-            result = self.screens[self.current_screen].handle_event(event_type, event_data)
-            if result:
-                event, data = result
-                self.handle_event(event, data)
-        
-        # 系统级事件处理
-        if event_type == "LOAD_BOOK" and "path" in event_data:
+        """处理事件
+
+        屏幕返回的衍生事件进队列迭代处理而不是递归调用，
+        并限制事件链长度，屏幕间互相触发也不会栈溢出或死循环。
+        """
+        pending = deque()
+        pending.append((event_type, event_data))
+        steps = 0
+
+        while pending:
+            steps += 1
+            if steps > self.MAX_EVENT_CHAIN:
+                self.logger.warning(f"事件链过长，疑似循环触发，丢弃: {list(pending)}")
+                break
+
+            event_type, event_data = pending.popleft()
+            self.logger.debug(f"处理事件: {event_type}, 数据: {event_data}")
+
+            if self.current_screen in self.screens:
+                result = self.screens[self.current_screen].handle_event(event_type, event_data)
+                if result:
+                    pending.append(result)
+
+            # 系统级事件处理
+            handler = self._handlers.get(event_type)
+            if handler:
+                handler(event_data)
+
+    def _h_load_book(self, event_data):
+        """LOAD_BOOK事件"""
+        if event_data and "path" in event_data:
             self.load_book(event_data["path"])
-        elif event_type == "EXIT":
-            self.running = False
-        elif event_type == "SAVE_CONFIG":
-            self.save_config()
-        elif event_type == "SHOW_HOME":
-            self.current_screen = "home"
-            self.show_current_screen()
-        elif event_type == "SHOW_MENU":
-            self.current_screen = "menu"
-            self.show_current_screen()
+
+    def _h_exit(self, event_data):
+        """EXIT事件"""
+        self.running = False
+
+    def _h_save_config(self, event_data):
+        """SAVE_CONFIG事件"""
+        self.save_config()
+
+    def _h_show_home(self, event_data):
+        """SHOW_HOME事件"""
+        self.current_screen = "home"
+        self.show_current_screen()
+
+    def _h_show_menu(self, event_data):
+        """SHOW_MENU事件"""
+        self.current_screen = "menu"
+        self.show_current_screen()
     
     def process_events(self):
-        """处理事件循环"""
-        # 处理GPIO事件
-        if self.gpio:
-            events = self.gpio.get_events()
-            for event_type, button in events:
-                if event_type == "BUTTON_CLICK":
-                    self.handle_button(button)
-                elif event_type == "BUTTON_LONG_PRESS":
-                    self.handle_button_long(button)
-        
+        """处理事件：阻塞等待一个GPIO事件，超时醒来检查运行状态"""
+        if not self.gpio:
+            time.sleep(0.05)
+            return
+
+        event = self.gpio.wait_for_event(timeout=1.0)
+        if not event:
+            return
+
+        event_type, data = event
+        # 长按事件携带 (按键名, 时长)
+        button = data[0] if isinstance(data, tuple) else data
+
+        if event_type == "BUTTON_CLICK":
+            self.handle_button(button)
+        elif event_type == "BUTTON_LONG_PRESS":
+            self.handle_button_long(button)
+
         # 这里可以添加其他事件源（如网络、定时器等）
     
     def handle_button(self, button):
         """处理按钮点击"""
-        button_events = {
-            "PREV": "PREV_PAGE",
-            "NEXT": "NEXT_PAGE",
-            "HOME": "SHOW_HOME",
-            "MENU": "SHOW_MENU"
-        }
-        
-        if button in button_events:
-            self.handle_event(button_events[button])
+        event = BUTTON_EVENTS.get(button)
+        if event:
+            self.handle_event(event)
     
     def handle_button_long(self, button):
         """处理按钮长按"""
@@ -243,12 +382,9 @@ class EinkReader:
         
         try:
             while self.running:
-                # 处理事件
+                # 处理事件（内部阻塞等待，空闲时不空转）
                 self.process_events()
-                
-                # 短暂休眠，降低CPU使用率
-                time.sleep(0.05)
-                
+
         except KeyboardInterrupt:
             self.logger.info("收到键盘中断信号")
         except Exception as e:
@@ -267,8 +403,10 @@ class EinkReader:
             self.display.clear()
             self.display.sleep()
         
-        self.save_config()
+        self.save_config(immediate=True)
         self.logger.info("程序退出")
+        # 冲刷并停止后台日志线程
+        shutdown_logging()
     
     def signal_handler(self, signum, frame):
         """信号处理"""
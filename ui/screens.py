@@ -2,14 +2,20 @@
 屏幕界面 - 各种界面屏幕的实现
 """
 
+import os
 import time
 import logging
 from typing import Optional, Dict, Any, Tuple
 from PIL import Image, ImageDraw
 
+from core.display_manager import DisplayManager
+
 class BaseScreen:
     """基础屏幕类"""
-    
+
+    # 时间字符串宽度缓存（类级共享，"HH:MM"每小时只有60种取值）
+    _time_width_cache = {}
+
     def __init__(self, display, book_manager, config):
         self.display = display
         self.book_manager = book_manager
@@ -19,64 +25,94 @@ class BaseScreen:
         # 屏幕参数
         self.width = display.width
         self.height = display.height
-        
+
+        # 复用的显示管理器与字体缓存（所有渲染路径共用）
+        self.dm = DisplayManager(config)
+        self.dm.width = self.width
+        self.dm.height = self.height
+        self._fonts = {}
+
         # 状态
         self.selected_index = 0
         self.need_refresh = True
-    
+        # 下次上屏使用局部刷新（选中项移动等小变化，避免整屏闪烁）
+        self._partial_refresh = False
+
+        # 事件分发表，子类在__init__里注册（字典查找代替if/elif链）
+        self._event_handlers = {}
+
     def show(self):
         """显示屏幕"""
         if self.need_refresh:
             self.render()
             self.need_refresh = False
-    
+
     def render(self):
         """渲染屏幕内容（子类实现）"""
         raise NotImplementedError
-    
+
     def handle_event(self, event_type: str, event_data: Any = None) -> Optional[Tuple[str, Any]]:
-        """处理事件（子类实现）"""
-        raise NotImplementedError
-    
+        """处理事件：查分发表，未注册的事件返回None"""
+        handler = self._event_handlers.get(event_type)
+        if handler is not None:
+            return handler(event_data)
+        return None
+
+    def _show(self, image: Image.Image):
+        """把渲染结果送上屏，按标记选择局部/全局刷新
+
+        与屏幕上已显示内容一致时直接跳过——墨水屏刷新是整个应用里
+        最贵的操作。哈希挂在display实例上，多个屏幕对象共享，
+        切换界面不会误判。
+        """
+        partial = self._partial_refresh
+        self._partial_refresh = False
+
+        frame_hash = hash(image.tobytes())
+        if frame_hash == getattr(self.display, '_last_shown_hash', None):
+            return
+
+        self.display.display(image, partial=partial)
+        self.display._last_shown_hash = frame_hash
+
+    def _font(self, size: int):
+        """获取字体（屏幕级缓存）"""
+        font = self._fonts.get(size)
+        if font is None:
+            font = self.dm.get_font(size)
+            self._fonts[size] = font
+        return font
+
     def draw_title_bar(self, image: Image.Image, title: str):
         """绘制标题栏"""
         draw = ImageDraw.Draw(image)
-        
+
         # 绘制标题背景
         draw.rectangle([0, 0, self.width-1, 40], fill=0)
-        
+
         # 绘制标题文字
-        try:
-            from core.display_manager import DisplayManager
-            dm = DisplayManager(self.config)
-            font = dm.get_font(18)
-        except:
-            font = None
-        
-        draw.text((20, 10), title, font=font, fill=255)
-    
+        draw.text((20, 10), title, font=self._font(18), fill=255)
+
     def draw_status_bar(self, image: Image.Image, status: str = ""):
         """绘制状态栏"""
         draw = ImageDraw.Draw(image)
-        
+
         # 绘制状态栏背景
         draw.rectangle([0, self.height-30, self.width-1, self.height-1], fill=0)
-        
+
         # 绘制状态文字
-        try:
-            from core.display_manager import DisplayManager
-            dm = DisplayManager(self.config)
-            font = dm.get_font(12)
-        except:
-            font = None
-        
+        font = self._font(12)
         if status:
             draw.text((20, self.height-25), status, font=font, fill=255)
         
-        # 绘制时间
+        # 绘制时间（宽度按字体+字符串缓存，避免每帧走FreeType测量）
         current_time = time.strftime("%H:%M")
-        time_width = draw.textlength(current_time, font=font) if font else 50
-        draw.text((self.width - time_width - 20, self.height-25), 
+        key = (id(font), current_time)
+        time_width = self._time_width_cache.get(key)
+        if time_width is None:
+            time_width = draw.textlength(current_time, font=font) if font else 50
+            self._time_width_cache[key] = time_width
+        draw.text((self.width - time_width - 20, self.height-25),
                  current_time, font=font, fill=255)
     
     def draw_selection_indicator(self, image: Image.Image, y: int, height: int):
@@ -92,18 +128,54 @@ class HomeScreen(BaseScreen):
         self.books = []
         self.items_per_page = 6
         self.current_page = 0
-    
+        # 书籍列表缓存，按目录mtime失效，避免每次按键都扫描目录
+        self._books_mtime = None
+        self._total_pages = 0
+        self._cached_rows = []
+
+        self._event_handlers = {
+            "NEXT_PAGE": self._on_next_page,
+            "PREV_PAGE": self._on_prev_page,
+            "UP": self._on_up,
+            "DOWN": self._on_down,
+            "SELECT": self._on_select,
+            "SHOW_MENU": self._on_show_menu,
+        }
+
+    def _get_books(self):
+        """获取书籍列表（目录未变化时直接用缓存）"""
+        try:
+            mtime = os.stat(self.book_manager.books_dir).st_mtime
+        except OSError:
+            mtime = None
+
+        if mtime is None or mtime != self._books_mtime:
+            self.books = self.book_manager.list_books()
+            self._books_mtime = mtime
+            self._total_pages = max(
+                1, (len(self.books) + self.items_per_page - 1) // self.items_per_page
+            )
+            # 行文本只在列表变化时拼一次，渲染时仅替换选中前缀
+            rows = []
+            for book in self.books:
+                name = book['name']
+                if len(name) > 20:
+                    name = name[:17] + "..."
+                rows.append(f"  {name} ({book['size']})")
+            self._cached_rows = rows
+        return self.books
+
+    def invalidate_books(self):
+        """强制下次渲染重新扫描书籍目录（上传/删除后调用）"""
+        self._books_mtime = None
+
     def render(self):
         """渲染主屏幕"""
-        from core.display_manager import DisplayManager
-        
-        dm = DisplayManager(self.config)
-        dm.width = self.width
-        dm.height = self.height
-        
+        dm = self.dm
+
         # 获取书籍列表
-        self.books = self.book_manager.list_books()
-        total_pages = (len(self.books) + self.items_per_page - 1) // self.items_per_page
+        self._get_books()
+        total_pages = self._total_pages
         
         # 创建页面内容
         lines = ["📚 我的书架", ""]
@@ -112,13 +184,10 @@ class HomeScreen(BaseScreen):
         end_idx = min(start_idx + self.items_per_page, len(self.books))
         
         for i in range(start_idx, end_idx):
-            book = self.books[i]
-            prefix = "▶ " if i == self.selected_index else "  "
-            # 截断长文件名
-            name = book['name']
-            if len(name) > 20:
-                name = name[:17] + "..."
-            lines.append(f"{prefix}{name} ({book['size']})")
+            row = self._cached_rows[i]
+            if i == self.selected_index:
+                row = "▶ " + row[2:]
+            lines.append(row)
         
         lines.append("")
         lines.append(f"第 {self.current_page + 1}/{total_pages} 页")
@@ -129,112 +198,161 @@ class HomeScreen(BaseScreen):
         page_info = f"共 {len(self.books)} 本书"
         
         image = dm.draw_text_page(content, page_info=page_info)
-        self.display.display(image)
+        self._show(image)
     
-    def handle_event(self, event_type: str, event_data: Any = None):
-        """处理主屏幕事件"""
-        if event_type == "NEXT_PAGE":
-            total_pages = (len(self.books) + self.items_per_page - 1) // self.items_per_page
-            if self.current_page < total_pages - 1:
+    def _on_next_page(self, event_data):
+        """书架翻下一页"""
+        if self.current_page < self._total_pages - 1:
+            self.current_page += 1
+            self.need_refresh = True
+            return ("REFRESH", None)
+        return None
+
+    def _on_prev_page(self, event_data):
+        """书架翻上一页"""
+        if self.current_page > 0:
+            self.current_page -= 1
+            self.need_refresh = True
+            return ("REFRESH", None)
+        return None
+
+    def _on_up(self, event_data):
+        """选中项上移"""
+        if self.selected_index > 0:
+            self.selected_index -= 1
+            # 如果超出当前页，翻到上一页
+            if self.selected_index < self.current_page * self.items_per_page:
+                self.current_page = max(0, self.current_page - 1)
+            else:
+                # 只是选中项移动，局部刷新即可
+                self._partial_refresh = True
+            self.need_refresh = True
+            return ("REFRESH", None)
+        return None
+
+    def _on_down(self, event_data):
+        """选中项下移"""
+        if self.selected_index < len(self.books) - 1:
+            self.selected_index += 1
+            # 如果超出当前页，翻到下一页
+            if self.selected_index >= (self.current_page + 1) * self.items_per_page:
                 self.current_page += 1
-                self.need_refresh = True
-                return ("REFRESH", None)
-        
-        elif event_type == "PREV_PAGE":
-            if self.current_page > 0:
-                self.current_page -= 1
-                self.need_refresh = True
-                return ("REFRESH", None)
-        
-        elif event_type == "UP":
-            if self.selected_index > 0:
-                self.selected_index -= 1
-                # 如果超出当前页，翻到上一页
-                if self.selected_index < self.current_page * self.items_per_page:
-                    self.current_page = max(0, self.current_page - 1)
-                self.need_refresh = True
-                return ("REFRESH", None)
-        
-        elif event_type == "DOWN":
-            if self.selected_index < len(self.books) - 1:
-                self.selected_index += 1
-                # 如果超出当前页，翻到下一页
-                items_per_page = self.items_per_page
-                if self.selected_index >= (self.current_page + 1) * items_per_page:
-                    self.current_page += 1
-                self.need_refresh = True
-                return ("REFRESH", None)
-        
-        elif event_type == "SELECT":
-            if 0 <= self.selected_index < len(self.books):
-                book = self.books[self.selected_index]
-                return ("LOAD_BOOK", {"path": book['path']})
-        
-        elif event_type == "SHOW_MENU":
-            return ("SHOW_MENU", None)
-        
+            else:
+                # 只是选中项移动，局部刷新即可
+                self._partial_refresh = True
+            self.need_refresh = True
+            return ("REFRESH", None)
         return None
 
+    def _on_select(self, event_data):
+        """打开选中的书籍"""
+        if 0 <= self.selected_index < len(self.books):
+            book = self.books[self.selected_index]
+            return ("LOAD_BOOK", {"path": book['path']})
+        return None
+
+    def _on_show_menu(self, event_data):
+        """进入菜单"""
+        return ("SHOW_MENU", None)
+
 class ReadingScreen(BaseScreen):
     """阅读屏幕"""
-    
+
+    def __init__(self, display, book_manager, config):
+        super().__init__(display, book_manager, config)
+        self._event_handlers = {
+            "NEXT_PAGE": self._on_next_page,
+            "PREV_PAGE": self._on_prev_page,
+            "SHOW_HOME": self._on_show_home,
+            "SHOW_MENU": self._on_show_menu,
+            "GOTO_PAGE": self._on_goto_page,
+        }
+
     def render(self):
         """渲染阅读屏幕"""
-        from core.display_manager import DisplayManager
-        
-        dm = DisplayManager(self.config)
-        dm.width = self.width
-        dm.height = self.height
-        
+        dm = self.dm
+
         # 获取当前页内容
         if self.book_manager.current_book_path:
-            book_name = self.book_manager.current_book_path.name
             page_content = self.book_manager.get_current_page()
-            current_page = self.book_manager.current_page + 1
-            total_pages = self.book_manager.total_pages
-            
+
             if page_content:
-                # 添加书籍名和页码
-                header = f"{book_name}\n"
-                content = header + page_content
-                page_info = f"第 {current_page}/{total_pages} 页"
-                
-                image = dm.draw_text_page(content, page_info=page_info)
-                self.display.display(image)
+                # 预渲染命中则直接上屏
+                page_num = self.book_manager.current_page
+                key = (str(self.book_manager.current_book_path), page_num)
+                image = dm.get_prefetched(key)
+
+                if image is None:
+                    image = dm.draw_text_page(
+                        self._page_text(page_num, page_content),
+                        page_info=self._page_info(page_num)
+                    )
+
+                self._show(image)
+
+                # 墨水屏刷新期间CPU空闲，预渲染相邻页
+                self._prefetch_adjacent()
                 return
-        
+
         # 没有书籍时的显示
         content = "暂无打开的书籍\n\n按 HOME 键返回主屏幕"
         image = dm.draw_text_page(content)
-        self.display.display(image)
+        self._show(image)
+
+    def _page_text(self, page_num: int, page_content: str) -> str:
+        """拼出带书籍名的页面文本"""
+        book_name = self.book_manager.current_book_path.name
+        return f"{book_name}\n{page_content}"
+
+    def _page_info(self, page_num: int) -> str:
+        """页码信息"""
+        return f"第 {page_num + 1}/{self.book_manager.total_pages} 页"
+
+    def _prefetch_adjacent(self):
+        """后台预渲染前后相邻页"""
+        book = str(self.book_manager.current_book_path)
+        current = self.book_manager.current_page
+
+        for page_num in (current + 1, current - 1):
+            content = self.book_manager.get_page(page_num)
+            if content:
+                self.dm.prefetch_page(
+                    (book, page_num),
+                    self._page_text(page_num, content),
+                    page_info=self._page_info(page_num)
+                )
     
-    def handle_event(self, event_type: str, event_data: Any = None):
-        """处理阅读屏幕事件"""
-        if event_type == "NEXT_PAGE":
-            if self.book_manager.next_page():
-                self.config["current_page"] = self.book_manager.current_page
-                self.need_refresh = True
-                return ("SAVE_CONFIG", None)
-        
-        elif event_type == "PREV_PAGE":
-            if self.book_manager.prev_page():
+    def _on_next_page(self, event_data):
+        """翻下一页"""
+        if self.book_manager.next_page():
+            self.config["current_page"] = self.book_manager.current_page
+            self.need_refresh = True
+            return ("SAVE_CONFIG", None)
+        return None
+
+    def _on_prev_page(self, event_data):
+        """翻上一页"""
+        if self.book_manager.prev_page():
+            self.config["current_page"] = self.book_manager.current_page
+            self.need_refresh = True
+            return ("SAVE_CONFIG", None)
+        return None
+
+    def _on_show_home(self, event_data):
+        """返回主屏幕"""
+        return ("SHOW_HOME", None)
+
+    def _on_show_menu(self, event_data):
+        """进入菜单"""
+        return ("SHOW_MENU", None)
+
+    def _on_goto_page(self, event_data):
+        """跳转到指定页"""
+        if isinstance(event_data, int):
+            if self.book_manager.go_to_page(event_data):
                 self.config["current_page"] = self.book_manager.current_page
                 self.need_refresh = True
                 return ("SAVE_CONFIG", None)
-        
-        elif event_type == "SHOW_HOME":
-            return ("SHOW_HOME", None)
-        
-        elif event_type == "SHOW_MENU":
-            return ("SHOW_MENU", None)
-        
-        elif event_type == "GOTO_PAGE":
-            if isinstance(event_data, int):
-                if self.book_manager.go_to_page(event_data):
-                    self.config["current_page"] = self.book_manager.current_page
-                    self.need_refresh = True
-                    return ("SAVE_CONFIG", None)
-        
         return None
 
 class MenuScreen(BaseScreen):
@@ -251,68 +369,78 @@ class MenuScreen(BaseScreen):
             ("关机", "SHUTDOWN")
         ]
         self.selected_index = 0
+        # 菜单项固定，行文本预先拼好，渲染时仅替换选中前缀
+        self._menu_rows = [f"  {text}" for text, _ in self.menu_items]
+
+        self._event_handlers = {
+            "UP": self._on_up,
+            "DOWN": self._on_down,
+            "SELECT": self._on_select,
+            "SHOW_HOME": self._on_show_home,
+        }
     
     def render(self):
         """渲染菜单屏幕"""
-        from core.display_manager import DisplayManager
-        
-        dm = DisplayManager(self.config)
-        dm.width = self.width
-        dm.height = self.height
-        
+        dm = self.dm
+
         # 创建菜单内容
         lines = ["⚙️ 菜单", ""]
         
-        for i, (text, _) in enumerate(self.menu_items):
-            prefix = "▶ " if i == self.selected_index else "  "
-            lines.append(f"{prefix}{text}")
+        for i, row in enumerate(self._menu_rows):
+            if i == self.selected_index:
+                row = "▶ " + row[2:]
+            lines.append(row)
         
         lines.append("")
         lines.append("使用 ↑↓ 选择，ENTER 确认，HOME 返回")
         
         content = "\n".join(lines)
         image = dm.draw_text_page(content)
-        self.display.display(image)
+        self._show(image)
     
-    def handle_event(self, event_type: str, event_data: Any = None):
-        """处理菜单事件"""
-        if event_type == "UP":
-            if self.selected_index > 0:
-                self.selected_index -= 1
-                self.need_refresh = True
-                return ("REFRESH", None)
-        
-        elif event_type == "DOWN":
-            if self.selected_index < len(self.menu_items) - 1:
-                self.selected_index += 1
-                self.need_refresh = True
-                return ("REFRESH", None)
-        
-        elif event_type == "SELECT":
-            _, action = self.menu_items[self.selected_index]
-            
-            if action == "BACK":
-                if self.book_manager.current_book_path:
-                    return ("SHOW_READING", None)
-                else:
-                    return ("SHOW_HOME", None)
-            
-            elif action == "SETTINGS":
-                return ("SHOW_SETTINGS", None)
-            
-            elif action == "BOOKMARKS":
-                return ("SHOW_BOOKMARKS", None)
-            
-            elif action == "WIFI_UPLOAD":
-                return ("START_WIFI_UPLOAD", None)
-            
-            elif action == "ABOUT":
-                return ("SHOW_ABOUT", None)
-            
-            elif action == "SHUTDOWN":
-                return ("SHUTDOWN_CONFIRM", None)
-        
-        elif event_type == "SHOW_HOME":
+    # 菜单动作到事件的映射（BACK需要按状态分支，单独处理）
+    _ACTION_EVENTS = {
+        "SETTINGS": "SHOW_SETTINGS",
+        "BOOKMARKS": "SHOW_BOOKMARKS",
+        "WIFI_UPLOAD": "START_WIFI_UPLOAD",
+        "ABOUT": "SHOW_ABOUT",
+        "SHUTDOWN": "SHUTDOWN_CONFIRM",
+    }
+
+    def _on_up(self, event_data):
+        """选中项上移"""
+        if self.selected_index > 0:
+            self.selected_index -= 1
+            # 菜单项固定单页，选中项移动用局部刷新
+            self._partial_refresh = True
+            self.need_refresh = True
+            return ("REFRESH", None)
+        return None
+
+    def _on_down(self, event_data):
+        """选中项下移"""
+        if self.selected_index < len(self.menu_items) - 1:
+            self.selected_index += 1
+            # 菜单项固定单页，选中项移动用局部刷新
+            self._partial_refresh = True
+            self.need_refresh = True
+            return ("REFRESH", None)
+        return None
+
+    def _on_select(self, event_data):
+        """执行选中的菜单项"""
+        _, action = self.menu_items[self.selected_index]
+
+        if action == "BACK":
+            if self.book_manager.current_book_path:
+                return ("SHOW_READING", None)
             return ("SHOW_HOME", None)
-        
-        return None
\ No newline at end of file
+
+        event = self._ACTION_EVENTS.get(action)
+        if event:
+            return (event, None)
+        return None
+
+    def _on_show_home(self, event_data):
+        """返回主屏幕"""
+        return ("SHOW_HOME", None)
\ No newline at end of file
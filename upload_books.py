@@ -7,6 +7,25 @@ import os
 import sys
 import shutil
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+def copy_book(src, dst):
+    """复制单个文件：Linux上用sendfile做内核侧拷贝，失败回退shutil"""
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            while remaining > 0:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        # 保留源文件时间戳（书架列表按修改时间展示）
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):
+        # 平台没有sendfile或拷贝中断，退回通用实现
+        shutil.copy2(src, dst)
 
 def upload_books(source_dir, target_dir="books"):
     """批量上传书籍"""
@@ -21,30 +40,42 @@ def upload_books(source_dir, target_dir="books"):
     target_path.mkdir(exist_ok=True)
     
     # 支持的文件格式
-    extensions = ['.txt', '.epub', '.pdf']
-    
-    # 查找并复制文件
+    extensions = {'.txt', '.epub', '.pdf'}
+
+    # 目标目录已有文件名，重名探测走内存集合而不是反复stat
+    existing = {entry.name for entry in os.scandir(target_path)}
+
+    # 查找文件并先分配好目标名（单次遍历源目录树，按扩展名过滤）
+    tasks = []
+    for root, _, files in os.walk(source_path):
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in extensions:
+                continue
+            book_file = Path(root) / name
+            target_file = target_path / name
+
+            # 处理重名文件
+            counter = 1
+            while target_file.name in existing:
+                target_file = target_path / f"{book_file.stem}_{counter}{book_file.suffix}"
+                counter += 1
+
+            existing.add(target_file.name)
+            tasks.append((book_file, target_file))
+
+    # 并发复制，让多个文件的SD卡读写延迟重叠
     copied_count = 0
-    for ext in extensions:
-        for book_file in source_path.glob(f"**/*{ext}"):
-            if book_file.is_file():
-                target_file = target_path / book_file.name
-                
-                # 处理重名文件
-                counter = 1
-                while target_file.exists():
-                    name = book_file.stem
-                    suffix = book_file.suffix
-                    target_file = target_path / f"{name}_{counter}{suffix}"
-                    counter += 1
-                
-                # 复制文件
-                try:
-                    shutil.copy2(book_file, target_file)
-                    print(f"已复制: {book_file.name} -> {target_file.name}")
-                    copied_count += 1
-                except Exception as e:
-                    print(f"复制失败 {book_file.name}: {e}")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = {pool.submit(copy_book, src, dst): (src, dst)
+                   for src, dst in tasks}
+        for future in as_completed(futures):
+            src, dst = futures[future]
+            try:
+                future.result()
+                print(f"已复制: {src.name} -> {dst.name}")
+                copied_count += 1
+            except Exception as e:
+                print(f"复制失败 {src.name}: {e}")
     
     print(f"\n完成！共复制 {copied_count} 本书籍")
     print(f"目录: {target_path.absolute()}")
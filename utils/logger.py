@@ -4,17 +4,43 @@
 
 import os
 import sys
+import atexit
+import queue
 import logging
+from logging.handlers import (
+    RotatingFileHandler, MemoryHandler, QueueHandler, QueueListener
+)
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+# 已配置好的logger，按名字缓存，重复调用直接返回
+_logger_cache = {}
+
+# 每个logger对应的后台监听线程，退出时统一停止
+_listeners = {}
+
+def _stop_listener(name: str):
+    """停止指定logger的后台日志线程（幂等）"""
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+def shutdown_logging():
+    """停止所有后台日志线程并冲刷剩余记录"""
+    for name in list(_listeners):
+        _stop_listener(name)
+
 def setup_logger(name: str, 
                  level: int = logging.INFO,
                  log_dir: Optional[str] = None,
                  console: bool = True) -> logging.Logger:
     """设置日志配置"""
-    
+
+    cached = _logger_cache.get(name)
+    if cached is not None:
+        return cached
+
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
@@ -28,13 +54,16 @@ def setup_logger(name: str,
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
+    # 真正做I/O的处理器，挂到后台监听线程而不是logger本身
+    handlers = []
+
     # 控制台处理器
     if console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-    
+        handlers.append(console_handler)
+
     # 文件处理器
     if log_dir:
         log_path = Path(log_dir)
@@ -44,11 +73,36 @@ def setup_logger(name: str,
         today = datetime.now().strftime('%Y-%m-%d')
         log_file = log_path / f"{name}_{today}.log"
         
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # 滚动文件 + 内存缓冲：攒满一批或遇到ERROR才落盘，
+        # 减少SD卡的小块写入（写放大和延迟尖刺的主因）
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=1_000_000, backupCount=5, encoding='utf-8'
+        )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+
+        buffer_handler = MemoryHandler(
+            capacity=256, flushLevel=logging.ERROR, target=file_handler
+        )
+        buffer_handler.setLevel(level)
+        handlers.append(buffer_handler)
+
+        # 进程退出时冲刷缓冲，避免丢掉最后一批日志
+        atexit.register(buffer_handler.close)
+
+    # 调用线程只把记录塞进队列（C实现的O(1)操作），
+    # 格式化和I/O由后台监听线程完成，主循环里的日志调用不再阻塞
+    if handlers:
+        log_queue = queue.Queue(-1)
+        logger.addHandler(QueueHandler(log_queue))
+
+        listener = QueueListener(log_queue, *handlers,
+                                 respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        atexit.register(_stop_listener, name)
+
+    _logger_cache[name] = logger
     return logger
 
 def get_log_file_path(name: str, log_dir: str) -> str:
@@ -60,17 +114,18 @@ def get_log_file_path(name: str, log_dir: str) -> str:
 def clear_old_logs(log_dir: str, days: int = 7):
     """清理旧日志文件"""
     import time
-    from pathlib import Path
-    
-    log_path = Path(log_dir)
-    if not log_path.exists():
+
+    if not os.path.isdir(log_dir):
         return
-    
+
     cutoff_time = time.time() - (days * 24 * 3600)
-    
-    for log_file in log_path.glob("*.log"):
-        if log_file.stat().st_mtime < cutoff_time:
+
+    # scandir的DirEntry缓存了目录读出的stat信息，不用每个文件再stat一次
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
             try:
-                log_file.unlink()
-            except Exception as e:
-                print(f"删除日志文件失败 {log_file}: {e}")
\ No newline at end of file
+                if (entry.name.endswith('.log')
+                        and entry.stat().st_mtime < cutoff_time):
+                    os.unlink(entry.path)
+            except OSError as e:
+                print(f"删除日志文件失败 {entry.path}: {e}")
\ No newline at end of file